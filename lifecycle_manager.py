@@ -4,240 +4,472 @@ BrainDriveChat Plugin Lifecycle Manager (New Architecture)
 
 This script handles install/update/delete operations for the BrainDriveChat plugin
 using the new multi-user plugin lifecycle management architecture.
+
+Performance note: everything here is I/O-bound (file copies and database round
+trips), not compute-bound, so JIT/Numba-style rewrites of the Python loops will
+not pay off. Prefer, in order: fewer database round trips (batched statements,
+explicit transactions, statements built once at import), keeping blocking file
+work off the event loop (asyncio.to_thread), and letting the stdlib/kernel do
+the copying (shutil.copytree, which uses sendfile on Linux).
 """
 
+import fnmatch
+import importlib
 import json
 import logging
 import datetime
 import os
+import re
 import shutil
+import sys
 import asyncio
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 import structlog
 
 logger = structlog.get_logger()
 
-# Import the new base lifecycle manager
+# Prefer orjson for parsing when it is installed; its JSONDecodeError subclasses
+# json.JSONDecodeError, so callers only need to handle the stdlib exception
 try:
-    # Try to import from the BrainDrive system first (when running in production)
-    from app.plugins.base_lifecycle_manager import BaseLifecycleManager
-    logger.info("Using new architecture: BaseLifecycleManager imported from app.plugins")
+    import orjson
+    _json_loads = orjson.loads
 except ImportError:
+    _json_loads = json.loads
+
+# Maximum number of top-level entries copied concurrently during installation
+_COPY_CONCURRENCY = 8
+
+# Files and directories excluded when copying the plugin (similar to build_archive.py),
+# compiled into a single regex so each name is matched once rather than per pattern
+_EXCLUDE_PATTERNS = (
+    'node_modules',
+    'package-lock.json',
+    '.git',
+    '.gitignore',
+    '__pycache__',
+    '*.pyc',
+    '.DS_Store',
+    'Thumbs.db'
+)
+_EXCLUDE_RE = re.compile('|'.join(fnmatch.translate(pattern) for pattern in _EXCLUDE_PATTERNS))
+
+
+def _ignore_excluded(directory: str, names) -> Set[str]:
+    """shutil.copytree ignore callback that skips excluded files and directories"""
+    return {name for name in names if _EXCLUDE_RE.match(name)}
+
+
+# SQL statements are built once at import and reused by every call
+_PLUGIN_INSERT_STMT = text("""
+INSERT INTO plugin
+(id, name, description, version, type, enabled, icon, category, status,
+official, author, last_updated, compatibility, downloads, scope,
+bundle_method, bundle_location, is_local, long_description,
+config_fields, messages, dependencies, created_at, updated_at, user_id,
+plugin_slug, source_type, source_url, update_check_url, last_update_check,
+update_available, latest_version, installation_type, permissions)
+VALUES
+(:id, :name, :description, :version, :type, :enabled, :icon, :category,
+:status, :official, :author, :last_updated, :compatibility, :downloads,
+:scope, :bundle_method, :bundle_location, :is_local, :long_description,
+:config_fields, :messages, :dependencies, :created_at, :updated_at, :user_id,
+:plugin_slug, :source_type, :source_url, :update_check_url, :last_update_check,
+:update_available, :latest_version, :installation_type, :permissions)
+""")
+
+_MODULE_INSERT_STMT = text("""
+INSERT INTO module
+(id, plugin_id, name, display_name, description, icon, category,
+enabled, priority, props, config_fields, messages, required_services,
+dependencies, layout, tags, created_at, updated_at, user_id)
+VALUES
+(:id, :plugin_id, :name, :display_name, :description, :icon, :category,
+:enabled, :priority, :props, :config_fields, :messages, :required_services,
+:dependencies, :layout, :tags, :created_at, :updated_at, :user_id)
+""")
+
+_VERIFY_INSTALL_QUERY = text("""
+SELECT p.id AS plugin_id, m.id AS module_id
+FROM plugin p
+LEFT JOIN module m ON m.plugin_id = p.id AND m.user_id = p.user_id
+WHERE p.id = :plugin_id AND p.user_id = :user_id
+""")
+
+_PLUGIN_STATUS_QUERY = text("""
+SELECT id, name, version, enabled, created_at, updated_at
+FROM plugin
+WHERE user_id = :user_id AND plugin_slug = :plugin_slug
+""")
+
+# Uninstall deletes are keyed on (user_id, plugin_slug), the same lookup
+# _check_existing_plugin uses, so rows with any id format are found.
+# They rely on the backend schema indexing plugin(user_id, plugin_slug) and
+# module(plugin_id); this plugin does not create indexes on shared tables.
+_MODULE_DELETE_STMT = text("""
+DELETE FROM module
+WHERE user_id = :user_id AND plugin_id IN (
+    SELECT id FROM plugin WHERE user_id = :user_id AND plugin_slug = :plugin_slug
+)
+""")
+
+_PLUGIN_DELETE_STMT = text("""
+DELETE FROM plugin
+WHERE user_id = :user_id AND plugin_slug = :plugin_slug
+""")
+
+# Used instead of _PLUGIN_DELETE_STMT on dialects that support DELETE ... RETURNING,
+# so the deleted row's real id is reported without a separate SELECT
+_PLUGIN_DELETE_RETURNING_STMT = text("""
+DELETE FROM plugin
+WHERE user_id = :user_id AND plugin_slug = :plugin_slug
+RETURNING id
+""")
+
+# Bulk uninstall statements; the expanding parameter renders as an IN (...) list.
+# Rows are matched per user on (user_id, plugin_slug), like the single-user deletes.
+_BULK_PLUGIN_OWNERS_QUERY = text("""
+SELECT user_id FROM plugin
+WHERE plugin_slug = :plugin_slug AND user_id IN :user_ids
+""").bindparams(bindparam('user_ids', expanding=True))
+
+_BULK_MODULE_DELETE_STMT = text("""
+DELETE FROM module
+WHERE user_id IN :user_ids AND plugin_id IN (
+    SELECT plugin.id FROM plugin
+    WHERE plugin.plugin_slug = :plugin_slug AND plugin.user_id = module.user_id
+)
+""").bindparams(bindparam('user_ids', expanding=True))
+
+_BULK_PLUGIN_DELETE_STMT = text("""
+DELETE FROM plugin
+WHERE plugin_slug = :plugin_slug AND user_id IN :user_ids
+""").bindparams(bindparam('user_ids', expanding=True))
+
+
+def _resolve_base_lifecycle_manager():
+    """
+    Locate BaseLifecycleManager, trying the BrainDrive backend package first and
+    a local development checkout second. Returns None if neither is available.
+    """
     try:
-        # Try local import for development
-        import sys
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        backend_path = os.path.join(current_dir, "..", "..", "backend", "app", "plugins")
-        backend_path = os.path.abspath(backend_path)
-        
-        if os.path.exists(backend_path):
-            if backend_path not in sys.path:
-                sys.path.insert(0, backend_path)
-            from base_lifecycle_manager import BaseLifecycleManager
-            logger.info(f"Using new architecture: BaseLifecycleManager imported from local backend: {backend_path}")
-        else:
-            # For remote installation, the base class might not be available
-            # In this case, we'll create a minimal implementation
-            logger.warning(f"BaseLifecycleManager not found at {backend_path}, using minimal implementation")
-            from abc import ABC, abstractmethod
-            from datetime import datetime
-            from pathlib import Path
-            from typing import Set
-            
-            class BaseLifecycleManager(ABC):
-                """Minimal base class for remote installations"""
-                def __init__(self, plugin_slug: str, version: str, shared_storage_path: Path):
-                    self.plugin_slug = plugin_slug
-                    self.version = version
-                    self.shared_path = shared_storage_path
-                    self.active_users: Set[str] = set()
-                    self.instance_id = f"{plugin_slug}_{version}"
-                    self.created_at = datetime.now()
-                    self.last_used = datetime.now()
-                
-                async def install_for_user(self, user_id: str, db, shared_plugin_path: Path):
-                    if user_id in self.active_users:
-                        return {'success': False, 'error': 'Plugin already installed for user'}
-                    result = await self._perform_user_installation(user_id, db, shared_plugin_path)
-                    if result['success']:
-                        self.active_users.add(user_id)
-                        self.last_used = datetime.now()
-                    return result
-                
-                async def uninstall_for_user(self, user_id: str, db):
-                    if user_id not in self.active_users:
-                        return {'success': False, 'error': 'Plugin not installed for user'}
-                    result = await self._perform_user_uninstallation(user_id, db)
-                    if result['success']:
-                        self.active_users.discard(user_id)
-                        self.last_used = datetime.now()
-                    return result
-                
-                @abstractmethod
-                async def get_plugin_metadata(self): pass
-                @abstractmethod
-                async def get_module_metadata(self): pass
-                @abstractmethod
-                async def _perform_user_installation(self, user_id, db, shared_plugin_path): pass
-                @abstractmethod
-                async def _perform_user_uninstallation(self, user_id, db): pass
-            
-            logger.info("Using minimal BaseLifecycleManager implementation for remote installation")
-            
+        # Try to import from the BrainDrive system first (when running in production)
+        module = importlib.import_module("app.plugins.base_lifecycle_manager")
+        logger.info("Using new architecture: BaseLifecycleManager imported from app.plugins")
+        return module.BaseLifecycleManager
+    except ImportError:
+        pass
+    
+    # Try local import for development; the path is only resolved when needed
+    backend_path = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend", "app", "plugins"))
+    if not os.path.exists(backend_path):
+        logger.warning(f"BaseLifecycleManager not found at {backend_path}, using minimal implementation")
+        return None
+    
+    if backend_path not in sys.path:
+        sys.path.insert(0, backend_path)
+    try:
+        module = importlib.import_module("base_lifecycle_manager")
     except ImportError as e:
         logger.error(f"Failed to import BaseLifecycleManager: {e}")
         raise ImportError("BrainDriveChat plugin requires the new architecture BaseLifecycleManager")
+    logger.info(f"Using new architecture: BaseLifecycleManager imported from local backend: {backend_path}")
+    return module.BaseLifecycleManager
+
+
+# Import the new base lifecycle manager. The resolved class is cached so that
+# reloading this module does not repeat the lookup.
+_BASE_LCM = globals().get('_BASE_LCM') or _resolve_base_lifecycle_manager()
+
+if _BASE_LCM is None:
+    # For remote installation, the base class might not be available
+    # In this case, we'll create a minimal implementation
+    from abc import ABC, abstractmethod
+    
+    class BaseLifecycleManager(ABC):
+        """Minimal base class for remote installations"""
+        def __init__(self, plugin_slug: str, version: str, shared_storage_path: Path):
+            self.plugin_slug = plugin_slug
+            self.version = version
+            self.shared_path = shared_storage_path
+            self.active_users: Set[str] = set()
+            self.instance_id = f"{plugin_slug}_{version}"
+            self.created_at = datetime.datetime.now()
+            self.last_used = datetime.datetime.now()
+        
+        async def install_for_user(self, user_id: str, db, shared_plugin_path: Path):
+            if user_id in self.active_users:
+                return {'success': False, 'error': 'Plugin already installed for user'}
+            result = await self._perform_user_installation(user_id, db, shared_plugin_path)
+            if result['success']:
+                self.active_users.add(user_id)
+                self.last_used = datetime.datetime.now()
+            return result
+        
+        async def uninstall_for_user(self, user_id: str, db):
+            if user_id not in self.active_users:
+                return {'success': False, 'error': 'Plugin not installed for user'}
+            result = await self._perform_user_uninstallation(user_id, db)
+            if result['success']:
+                self.active_users.discard(user_id)
+                self.last_used = datetime.datetime.now()
+            return result
+        
+        @abstractmethod
+        async def get_plugin_metadata(self): pass
+        @abstractmethod
+        async def get_module_metadata(self): pass
+        @abstractmethod
+        async def _perform_user_installation(self, user_id, db, shared_plugin_path): pass
+        @abstractmethod
+        async def _perform_user_uninstallation(self, user_id, db): pass
+    
+    _BASE_LCM = BaseLifecycleManager
+    logger.info("Using minimal BaseLifecycleManager implementation for remote installation")
+
+BaseLifecycleManager = _BASE_LCM
+
+
+class _PluginNotFoundError(Exception):
+    """Raised inside a transaction block to roll it back when the plugin row is missing"""
+
+
+def _supports_delete_returning(db: AsyncSession) -> bool:
+    """Whether the session's dialect can run DELETE ... RETURNING"""
+    try:
+        dialect = db.get_bind().dialect
+    except Exception:
+        return False
+    return bool(getattr(dialect, 'delete_returning', False))
+
+
+@asynccontextmanager
+async def _transaction(db: AsyncSession):
+    """
+    Run a block of statements in a single transaction that commits on success
+    and rolls back on error. If the session already has a transaction open
+    (e.g. from an earlier SELECT), that transaction is used and committed.
+    """
+    if db.in_transaction():
+        try:
+            yield
+        except Exception:
+            await db.rollback()
+            raise
+        await db.commit()
+    else:
+        async with db.begin():
+            yield
+
+
+def _freeze(value):
+    """Recursively wrap dicts in read-only MappingProxyType views and lists in tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Return a plain, mutable and JSON-serializable deep copy of a frozen value"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class _ThawedData:
+    """Class attribute that returns a plain copy of frozen data on every access"""
+    
+    def __init__(self, value):
+        self._value = value
+    
+    def __get__(self, obj, owner=None):
+        return _thaw(self._value)
+
+
+# Plugin-specific data, shared by every manager instance (frozen below)
+_PLUGIN_DATA = {
+    "name": "BrainDriveChat",
+    "description": "Comprehensive AI chat interface with model selection and conversation history",
+    "version": "1.0.29",
+    "type": "frontend",
+    "icon": "MessageSquare",
+    "category": "ai",
+    "official": True,
+    "author": "BrainDrive",
+    "compatibility": "1.0.0",
+    "scope": "BrainDriveChat",
+    "bundle_method": "webpack",
+    "bundle_location": "dist/remoteEntry.js",
+    "is_local": False,
+    "long_description": "A unified AI chat interface that combines AI prompt chat, model selection, and conversation history management in a single, responsive plugin with light/dark theme support.",
+    "plugin_slug": "BrainDriveChat",
+    # Update tracking fields (matching plugin model)
+    "source_type": "github",
+    "source_url": "https://github.com/BrainDriveAI/BrainDrive-Chat-Plugin",
+    "update_check_url": "https://github.com/BrainDriveAI/BrainDrive-Chat-Plugin/releases/latest",
+    "last_update_check": None,
+    "update_available": False,
+    "latest_version": None,
+    "installation_type": "remote",
+    "permissions": ["storage.read", "storage.write", "api.access"]
+}
+
+_MODULE_DATA = [
+    {
+        "name": "BrainDriveChat",
+        "display_name": "AI Chat Interface",
+        "description": "Complete AI chat interface with model selection and conversation history",
+        "icon": "MessageSquare",
+        "category": "ai",
+        "priority": 1,
+        "props": {
+            "initialGreeting": "Welcome to your BrainDrive!\\n\\nRemember you always have your {white_label_settings:OWNERS_MANUAL} and {white_label_settings:COMMUNITY} available.\\n\\nhow can I help you today?",
+            "defaultStreamingMode": True,
+            "promptQuestion": "What would you like to know?"
+        },
+        "config_fields": {
+            "initial_greeting": {
+                "type": "text",
+                "description": "Initial greeting message from AI",
+                "default": "Welcome to your BrainDrive!\\n\\nRemember you always have your {white_label_settings:OWNERS_MANUAL} and {white_label_settings:COMMUNITY} available.\\n\\nhow can I help you today?"
+            },
+            "enable_streaming": {
+                "type": "boolean",
+                "description": "Enable streaming responses by default",
+                "default": True
+            },
+            "max_conversation_history": {
+                "type": "number",
+                "description": "Maximum number of conversations to show in history",
+                "default": 50
+            },
+            "auto_save_conversations": {
+                "type": "boolean",
+                "description": "Automatically save conversations",
+                "default": True
+            },
+            "show_model_selection": {
+                "type": "boolean",
+                "description": "Show model selection dropdown",
+                "default": True
+            },
+            "show_conversation_history": {
+                "type": "boolean",
+                "description": "Show conversation history panel",
+                "default": True
+            },
+            "conversation_type": {
+                "type": "text",
+                "description": "Conversation type namespace used to isolate conversation history",
+                "default": "chat"
+            },
+            "default_library_scope_enabled": {
+                "type": "boolean",
+                "description": "Enable Library scope by default for new chats on this page",
+                "default": False
+            },
+            "default_project_slug": {
+                "type": "text",
+                "description": "Default Library project slug for focused pages",
+                "default": None
+            },
+            "default_project_lifecycle": {
+                "type": "text",
+                "description": "Lifecycle used when resolving default project slug",
+                "default": "active"
+            },
+            "default_persona_id": {
+                "type": "text",
+                "description": "Default persona ID for new chats on this page",
+                "default": None
+            },
+            "default_model_key": {
+                "type": "text",
+                "description": "Default model key in <provider>::<serverId>::<modelName> format",
+                "default": None
+            },
+            "apply_defaults_on_new_chat": {
+                "type": "boolean",
+                "description": "Re-apply configured defaults when starting a new chat",
+                "default": True
+            },
+            "lock_project_scope": {
+                "type": "boolean",
+                "description": "Prevent changing Library project scope on focused pages",
+                "default": False
+            },
+            "lock_persona_selection": {
+                "type": "boolean",
+                "description": "Prevent changing persona selection on focused pages",
+                "default": False
+            },
+            "lock_model_selection": {
+                "type": "boolean",
+                "description": "Prevent changing model selection on focused pages",
+                "default": False
+            }
+        },
+        "messages": {},
+        "required_services": {
+            "api": {"methods": ["get", "post", "put", "delete", "postStreaming"], "version": "1.0.0"},
+            "event": {"methods": ["sendMessage", "subscribeToMessages", "unsubscribeFromMessages"], "version": "1.0.0"},
+            "theme": {"methods": ["getCurrentTheme", "addThemeChangeListener", "removeThemeChangeListener"], "version": "1.0.0"},
+            "settings": {"methods": ["getSetting", "setSetting", "getSettingDefinitions"], "version": "1.0.0"},
+            "pageContext": {"methods": ["getCurrentPageContext", "onPageContextChange"], "version": "1.0.0"}
+        },
+        "dependencies": [],
+        "layout": {
+            "minWidth": 6,
+            "minHeight": 6,
+            "defaultWidth": 8,
+            "defaultHeight": 8
+        },
+        "tags": ["ai", "chat", "conversation", "assistant", "model-selection", "history"]
+    }
+]
+
+# Serialize the static JSON columns once instead of on every install
+_PLUGIN_PERMISSIONS_JSON = json.dumps(_PLUGIN_DATA['permissions'])
+_MODULE_DATA_DB = [
+    {
+        **module,
+        **{field: json.dumps(module[field]) for field in (
+            'props', 'config_fields', 'messages', 'required_services',
+            'dependencies', 'layout', 'tags'
+        )}
+    }
+    for module in _MODULE_DATA
+]
+
+# Freeze the shared definitions so no caller can mutate them for later installs
+# (or let them drift from the pre-serialized columns above)
+_PLUGIN_DATA = _freeze(_PLUGIN_DATA)
+_MODULE_DATA = _freeze(_MODULE_DATA)
 
 
 class BrainDriveChatLifecycleManager(BaseLifecycleManager):
     """Lifecycle manager for BrainDriveChat plugin using new architecture"""
     
+    # Compatibility attributes for remote installer validation and module data access;
+    # they hand out plain dicts and lists so callers can json.dumps() or modify them
+    PLUGIN_DATA = _ThawedData(_PLUGIN_DATA)
+    MODULE_DATA = _ThawedData(_MODULE_DATA)
+    
     def __init__(self, plugins_base_dir: str = None):
         """Initialize the lifecycle manager"""
-        # Define plugin-specific data
-        self.plugin_data = {
-            "name": "BrainDriveChat",
-            "description": "Comprehensive AI chat interface with model selection and conversation history",
-            "version": "1.0.29",
-            "type": "frontend",
-            "icon": "MessageSquare",
-            "category": "ai",
-            "official": True,
-            "author": "BrainDrive",
-            "compatibility": "1.0.0",
-            "scope": "BrainDriveChat",
-            "bundle_method": "webpack",
-            "bundle_location": "dist/remoteEntry.js",
-            "is_local": False,
-            "long_description": "A unified AI chat interface that combines AI prompt chat, model selection, and conversation history management in a single, responsive plugin with light/dark theme support.",
-            "plugin_slug": "BrainDriveChat",
-            # Update tracking fields (matching plugin model)
-            "source_type": "github",
-            "source_url": "https://github.com/BrainDriveAI/BrainDrive-Chat-Plugin",
-            "update_check_url": "https://github.com/BrainDriveAI/BrainDrive-Chat-Plugin/releases/latest",
-            "last_update_check": None,
-            "update_available": False,
-            "latest_version": None,
-            "installation_type": "remote",
-            "permissions": ["storage.read", "storage.write", "api.access"]
-        }
-        
-        self.module_data = [
-            {
-                "name": "BrainDriveChat",
-                "display_name": "AI Chat Interface",
-                "description": "Complete AI chat interface with model selection and conversation history",
-                "icon": "MessageSquare",
-                "category": "ai",
-                "priority": 1,
-                "props": {
-                    "initialGreeting": "Welcome to your BrainDrive!\\n\\nRemember you always have your {white_label_settings:OWNERS_MANUAL} and {white_label_settings:COMMUNITY} available.\\n\\nhow can I help you today?",
-                    "defaultStreamingMode": True,
-                    "promptQuestion": "What would you like to know?"
-                },
-                "config_fields": {
-                    "initial_greeting": {
-                        "type": "text",
-                        "description": "Initial greeting message from AI",
-                        "default": "Welcome to your BrainDrive!\\n\\nRemember you always have your {white_label_settings:OWNERS_MANUAL} and {white_label_settings:COMMUNITY} available.\\n\\nhow can I help you today?"
-                    },
-                    "enable_streaming": {
-                        "type": "boolean",
-                        "description": "Enable streaming responses by default",
-                        "default": True
-                    },
-                    "max_conversation_history": {
-                        "type": "number",
-                        "description": "Maximum number of conversations to show in history",
-                        "default": 50
-                    },
-                    "auto_save_conversations": {
-                        "type": "boolean",
-                        "description": "Automatically save conversations",
-                        "default": True
-                    },
-                    "show_model_selection": {
-                        "type": "boolean",
-                        "description": "Show model selection dropdown",
-                        "default": True
-                    },
-                    "show_conversation_history": {
-                        "type": "boolean",
-                        "description": "Show conversation history panel",
-                        "default": True
-                    },
-                    "conversation_type": {
-                        "type": "text",
-                        "description": "Conversation type namespace used to isolate conversation history",
-                        "default": "chat"
-                    },
-                    "default_library_scope_enabled": {
-                        "type": "boolean",
-                        "description": "Enable Library scope by default for new chats on this page",
-                        "default": False
-                    },
-                    "default_project_slug": {
-                        "type": "text",
-                        "description": "Default Library project slug for focused pages",
-                        "default": None
-                    },
-                    "default_project_lifecycle": {
-                        "type": "text",
-                        "description": "Lifecycle used when resolving default project slug",
-                        "default": "active"
-                    },
-                    "default_persona_id": {
-                        "type": "text",
-                        "description": "Default persona ID for new chats on this page",
-                        "default": None
-                    },
-                    "default_model_key": {
-                        "type": "text",
-                        "description": "Default model key in <provider>::<serverId>::<modelName> format",
-                        "default": None
-                    },
-                    "apply_defaults_on_new_chat": {
-                        "type": "boolean",
-                        "description": "Re-apply configured defaults when starting a new chat",
-                        "default": True
-                    },
-                    "lock_project_scope": {
-                        "type": "boolean",
-                        "description": "Prevent changing Library project scope on focused pages",
-                        "default": False
-                    },
-                    "lock_persona_selection": {
-                        "type": "boolean",
-                        "description": "Prevent changing persona selection on focused pages",
-                        "default": False
-                    },
-                    "lock_model_selection": {
-                        "type": "boolean",
-                        "description": "Prevent changing model selection on focused pages",
-                        "default": False
-                    }
-                },
-                "messages": {},
-                "required_services": {
-                    "api": {"methods": ["get", "post", "put", "delete", "postStreaming"], "version": "1.0.0"},
-                    "event": {"methods": ["sendMessage", "subscribeToMessages", "unsubscribeFromMessages"], "version": "1.0.0"},
-                    "theme": {"methods": ["getCurrentTheme", "addThemeChangeListener", "removeThemeChangeListener"], "version": "1.0.0"},
-                    "settings": {"methods": ["getSetting", "setSetting", "getSettingDefinitions"], "version": "1.0.0"},
-                    "pageContext": {"methods": ["getCurrentPageContext", "onPageContextChange"], "version": "1.0.0"}
-                },
-                "dependencies": [],
-                "layout": {
-                    "minWidth": 6,
-                    "minHeight": 6,
-                    "defaultWidth": 8,
-                    "defaultHeight": 8
-                },
-                "tags": ["ai", "chat", "conversation", "assistant", "model-selection", "history"]
-            }
-        ]
+        # Plugin-specific data lives at module level so it is not rebuilt per instance
+        self.plugin_data = _PLUGIN_DATA
+        self.module_data = _MODULE_DATA
         
         # Initialize base class with required parameters
         logger.info(f"BrainDriveChat: plugins_base_dir - {plugins_base_dir}")
@@ -256,18 +488,13 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
             shared_storage_path=shared_path
         )
     
-    @property
-    def PLUGIN_DATA(self):
-        """Compatibility property for remote installer validation"""
-        return self.plugin_data
-    
     async def get_plugin_metadata(self) -> Dict[str, Any]:
-        """Return plugin metadata and configuration"""
-        return self.plugin_data
+        """Return plugin metadata and configuration as a fresh plain copy"""
+        return _thaw(self.plugin_data)
     
     async def get_module_metadata(self) -> list:
-        """Return module definitions for this plugin"""
-        return self.module_data
+        """Return module definitions for this plugin as a fresh plain copy"""
+        return _thaw(self.module_data)
     
     async def _perform_user_installation(self, user_id: str, db: AsyncSession, shared_plugin_path: Path) -> Dict[str, Any]:
         """Perform user-specific installation using shared plugin path"""
@@ -293,27 +520,21 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
     async def _perform_user_uninstallation(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
         """Perform user-specific uninstallation"""
         try:
-            # Check if plugin exists for user
-            existing_check = await self._check_existing_plugin(user_id, db)
-            if not existing_check['exists']:
-                return {'success': False, 'error': 'Plugin not found for user'}
-            
-            plugin_id = existing_check['plugin_id']
-            
-            # Delete database records
-            delete_result = await self._delete_database_records(user_id, plugin_id, db)
+            # The DELETEs are keyed on (user_id, plugin_slug) and double as the
+            # existence check, so no separate SELECT is needed up front
+            delete_result = await self._delete_database_records(user_id, db)
             if not delete_result['success']:
                 return delete_result
             
-            logger.info(f"BrainDriveChat: User uninstallation completed for {user_id}")
+            logger.info("BrainDriveChat: User uninstallation completed", user_id=user_id, plugin_id=delete_result['plugin_id'])
             return {
                 'success': True,
-                'plugin_id': plugin_id,
+                'plugin_id': delete_result['plugin_id'],
                 'deleted_modules': delete_result['deleted_modules']
             }
             
         except Exception as e:
-            logger.error(f"BrainDriveChat: User uninstallation failed for {user_id}: {e}")
+            logger.error("BrainDriveChat: User uninstallation failed", user_id=user_id, error=str(e))
             return {'success': False, 'error': str(e)}
     
     async def _copy_plugin_files_impl(self, user_id: str, target_dir: Path, update: bool = False) -> Dict[str, Any]:
@@ -326,82 +547,59 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
             source_dir = Path(__file__).parent
             copied_files = []
             
-            # Define files and directories to exclude (similar to build_archive.py)
-            exclude_patterns = {
-                'node_modules',
-                'package-lock.json',
-                '.git',
-                '.gitignore',
-                '__pycache__',
-                '*.pyc',
-                '.DS_Store',
-                'Thumbs.db'
-            }
-            
-            def should_copy(path: Path) -> bool:
-                """Check if a file/directory should be copied"""
-                # Check if any part of the path matches exclude patterns
-                for part in path.parts:
-                    if part in exclude_patterns:
-                        return False
-                # Check for pattern matches
-                for pattern in exclude_patterns:
-                    if '*' in pattern and path.name.endswith(pattern.replace('*', '')):
-                        return False
-                return True
-            
-            # Copy all files and directories recursively
-            for item in source_dir.rglob('*'):
-                # Skip the lifecycle_manager.py file itself to avoid infinite recursion
-                if item.name == 'lifecycle_manager.py' and item == Path(__file__):
-                    continue
-                    
-                # Get relative path from source directory
-                relative_path = item.relative_to(source_dir)
-                
-                # Check if we should copy this item
-                if not should_copy(relative_path):
-                    continue
-                
-                target_path = target_dir / relative_path
-                
+            def copy_file(src: str, dst: str) -> str:
+                """Copy a single file and record it relative to the target directory"""
+                if update and os.path.lexists(dst):
+                    os.unlink(dst)  # Remove existing file
+                shutil.copy2(src, dst)
+                copied_files.append(os.path.relpath(dst, target_dir))
+                return dst
+            
+            def list_entries() -> list:
+                """List the top-level source entries; scandir caches each entry's type"""
+                with os.scandir(source_dir) as it:
+                    return list(it)
+            
+            def copy_entry(entry: os.DirEntry) -> None:
+                """Copy one top-level entry of the source tree; excluded directories
+                below it are pruned by the ignore callback so they are never walked"""
+                target_path = os.path.join(target_dir, entry.name)
                 try:
-                    if item.is_file():
-                        # Create parent directories if they don't exist
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Copy file
-                        if update and target_path.exists():
-                            target_path.unlink()  # Remove existing file
-                        shutil.copy2(item, target_path)
-                        copied_files.append(str(relative_path))
-                        logger.debug(f"Copied file: {relative_path}")
-                        
-                    elif item.is_dir():
-                        # Create directory
-                        target_path.mkdir(parents=True, exist_ok=True)
-                        logger.debug(f"Created directory: {relative_path}")
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to copy {relative_path}: {e}")
-                    continue
-            
-            # Also copy the lifecycle_manager.py file itself
-            lifecycle_manager_source = source_dir / 'lifecycle_manager.py'
-            lifecycle_manager_target = target_dir / 'lifecycle_manager.py'
-            if lifecycle_manager_source.exists():
-                lifecycle_manager_target.parent.mkdir(parents=True, exist_ok=True)
-                if update and lifecycle_manager_target.exists():
-                    lifecycle_manager_target.unlink()
-                shutil.copy2(lifecycle_manager_source, lifecycle_manager_target)
-                copied_files.append('lifecycle_manager.py')
-                logger.info(f"Copied lifecycle_manager.py")
-            
-            logger.info(f"BrainDriveChat: Copied {len(copied_files)} files/directories to {target_dir}")
+                    if entry.is_dir():
+                        shutil.copytree(
+                            entry.path,
+                            target_path,
+                            ignore=_ignore_excluded,
+                            copy_function=copy_file,
+                            dirs_exist_ok=True
+                        )
+                    else:
+                        copy_file(entry.path, target_path)
+                except shutil.Error as e:
+                    # copytree keeps going past individual failures and reports them together
+                    for src, _dst, reason in e.args[0]:
+                        logger.warning("BrainDriveChat: Failed to copy file", path=src, reason=reason)
+                except OSError as e:
+                    logger.warning("BrainDriveChat: Failed to copy file", path=entry.path, reason=str(e))
+            
+            # Copy the top-level entries concurrently on worker threads so the
+            # event loop stays free for other installs while the copies run
+            target_dir.mkdir(parents=True, exist_ok=True)
+            entries = await asyncio.to_thread(list_entries)
+            ignored = _ignore_excluded(str(source_dir), [entry.name for entry in entries])
+            semaphore = asyncio.Semaphore(_COPY_CONCURRENCY)
+            
+            async def copy_entry_bounded(entry: os.DirEntry) -> None:
+                async with semaphore:
+                    await asyncio.to_thread(copy_entry, entry)
+            
+            await asyncio.gather(*(copy_entry_bounded(entry) for entry in entries if entry.name not in ignored))
+            
+            logger.info("BrainDriveChat: Copied plugin files", count=len(copied_files), target_dir=str(target_dir))
             return {'success': True, 'copied_files': copied_files}
             
         except Exception as e:
-            logger.error(f"BrainDriveChat: Error copying plugin files: {e}")
+            logger.error("BrainDriveChat: Error copying plugin files", error=str(e))
             return {'success': False, 'error': str(e)}
     
     async def _validate_installation_impl(self, user_id: str, plugin_dir: Path) -> Dict[str, Any]:
@@ -410,13 +608,28 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
         This method is called by the base class during installation.
         """
         try:
-            # Check for BrainDriveChat-specific required files
-            required_files = ["package.json", "dist/remoteEntry.js"]
-            missing_files = []
+            package_json_path = plugin_dir / "package.json"
+            bundle_path = plugin_dir / "dist" / "remoteEntry.js"
+            
+            def get_bundle_size() -> Optional[int]:
+                """Return the bundle size, or None if the bundle is missing"""
+                try:
+                    return bundle_path.stat().st_size
+                except FileNotFoundError:
+                    return None
+            
+            # Check for BrainDriveChat-specific required files concurrently on worker
+            # threads; the bundle stat doubles as its existence check
+            package_json_exists, bundle_size = await asyncio.gather(
+                asyncio.to_thread(package_json_path.exists),
+                asyncio.to_thread(get_bundle_size)
+            )
             
-            for file_path in required_files:
-                if not (plugin_dir / file_path).exists():
-                    missing_files.append(file_path)
+            missing_files = []
+            if not package_json_exists:
+                missing_files.append("package.json")
+            if bundle_size is None:
+                missing_files.append("dist/remoteEntry.js")
             
             if missing_files:
                 return {
@@ -425,10 +638,8 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                 }
             
             # Validate package.json structure
-            package_json_path = plugin_dir / "package.json"
             try:
-                with open(package_json_path, 'r') as f:
-                    package_data = json.load(f)
+                package_data = _json_loads(await asyncio.to_thread(package_json_path.read_bytes))
                 
                 # Check for required package.json fields
                 required_fields = ["name", "version"]
@@ -445,9 +656,8 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                     'error': f'BrainDriveChat: Invalid or missing package.json: {e}'
                 }
             
-            # Validate bundle file exists and is not empty
-            bundle_path = plugin_dir / "dist" / "remoteEntry.js"
-            if bundle_path.stat().st_size == 0:
+            # Validate bundle file is not empty
+            if bundle_size == 0:
                 return {
                     'valid': False,
                     'error': 'BrainDriveChat: Bundle file (remoteEntry.js) is empty'
@@ -473,25 +683,25 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                 'assets_present': False
             }
             
-            # Check bundle file
+            # Check bundle file; a single stat covers both existence and size
             bundle_path = plugin_dir / "dist" / "remoteEntry.js"
-            if bundle_path.exists():
-                health_info['bundle_exists'] = True
+            try:
                 health_info['bundle_size'] = bundle_path.stat().st_size
+                health_info['bundle_exists'] = True
+            except FileNotFoundError:
+                pass
             
-            # Check package.json
+            # Check package.json; reading it directly doubles as the existence check
             package_json_path = plugin_dir / "package.json"
-            if package_json_path.exists():
-                try:
-                    with open(package_json_path, 'r') as f:
-                        json.load(f)
-                    health_info['package_json_valid'] = True
-                except json.JSONDecodeError:
-                    pass
+            try:
+                _json_loads(await asyncio.to_thread(package_json_path.read_bytes))
+                health_info['package_json_valid'] = True
+            except (json.JSONDecodeError, FileNotFoundError):
+                pass
             
-            # Check for assets directory
+            # Check for assets directory (is_dir() is False for missing paths)
             assets_path = plugin_dir / "assets"
-            if assets_path.exists() and assets_path.is_dir():
+            if assets_path.is_dir():
                 health_info['assets_present'] = True
             
             # Determine overall health
@@ -517,13 +727,7 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
         """Check if plugin already exists for user"""
         try:
             plugin_slug = self.plugin_data['plugin_slug']
-            logger.info(f"BrainDriveChat: Checking for existing plugin - user_id: {user_id}, plugin_slug: {plugin_slug}")
-            
-            # First test database connectivity
-            test_query = text("SELECT COUNT(*) as count FROM plugin")
-            test_result = await db.execute(test_query)
-            test_row = test_result.fetchone()
-            logger.info(f"BrainDriveChat: Database connectivity test - total plugins: {test_row.count}")
+            logger.info("BrainDriveChat: Checking for existing plugin", user_id=user_id, plugin_slug=plugin_slug)
             
             plugin_query = text("""
             SELECT id, name, version, enabled, created_at, updated_at, plugin_slug
@@ -535,14 +739,14 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                 'user_id': user_id,
                 'plugin_slug': plugin_slug
             }
-            logger.info(f"BrainDriveChat: Executing query with params: {query_params}")
+            logger.info("BrainDriveChat: Executing query", params=query_params)
             
             result = await db.execute(plugin_query, query_params)
             
             plugin_row = result.fetchone()
-            logger.info(f"BrainDriveChat: Query result: {plugin_row}")
+            logger.info("BrainDriveChat: Query result", row=plugin_row)
             if plugin_row:
-                logger.info(f"BrainDriveChat: Found existing plugin - id: {plugin_row.id}, name: {plugin_row.name}")
+                logger.info("BrainDriveChat: Found existing plugin", plugin_id=plugin_row.id, name=plugin_row.name)
                 return {
                     'exists': True,
                     'plugin_id': plugin_row.id,
@@ -556,23 +760,12 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                     }
                 }
             else:
-                logger.warning(f"BrainDriveChat: No plugin found for user_id: {user_id}, plugin_slug: {plugin_slug}")
-                
-                # Debug: Check if there are any plugins for this user
-                debug_query = text("SELECT id, plugin_slug FROM plugin WHERE user_id = :user_id")
-                debug_result = await db.execute(debug_query, {'user_id': user_id})
-                debug_rows = debug_result.fetchall()
-                if debug_rows:
-                    logger.info(f"BrainDriveChat: User has {len(debug_rows)} other plugins:")
-                    for row in debug_rows:
-                        logger.info(f"  - {row.plugin_slug} (id: {row.id})")
-                else:
-                    logger.info(f"BrainDriveChat: User has no plugins installed")
+                logger.warning("BrainDriveChat: No plugin found", user_id=user_id, plugin_slug=plugin_slug)
                 
                 return {'exists': False}
                 
         except Exception as e:
-            logger.error(f"BrainDriveChat: Error checking existing plugin: {e}")
+            logger.error("BrainDriveChat: Error checking existing plugin", error=str(e))
             return {'exists': False, 'error': str(e)}
     
     async def _create_database_records(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
@@ -582,26 +775,9 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
             plugin_slug = self.plugin_data['plugin_slug']
             plugin_id = f"{user_id}_{plugin_slug}"
             
-            logger.info(f"BrainDriveChat: Creating database records - user_id: {user_id}, plugin_slug: {plugin_slug}, plugin_id: {plugin_id}")
-            
-            plugin_stmt = text("""
-            INSERT INTO plugin
-            (id, name, description, version, type, enabled, icon, category, status,
-            official, author, last_updated, compatibility, downloads, scope,
-            bundle_method, bundle_location, is_local, long_description,
-            config_fields, messages, dependencies, created_at, updated_at, user_id,
-            plugin_slug, source_type, source_url, update_check_url, last_update_check,
-            update_available, latest_version, installation_type, permissions)
-            VALUES
-            (:id, :name, :description, :version, :type, :enabled, :icon, :category,
-            :status, :official, :author, :last_updated, :compatibility, :downloads,
-            :scope, :bundle_method, :bundle_location, :is_local, :long_description,
-            :config_fields, :messages, :dependencies, :created_at, :updated_at, :user_id,
-            :plugin_slug, :source_type, :source_url, :update_check_url, :last_update_check,
-            :update_available, :latest_version, :installation_type, :permissions)
-            """)
+            logger.info("BrainDriveChat: Creating database records", user_id=user_id, plugin_slug=plugin_slug, plugin_id=plugin_id)
             
-            await db.execute(plugin_stmt, {
+            plugin_params = {
                 'id': plugin_id,
                 'name': self.plugin_data['name'],
                 'description': self.plugin_data['description'],
@@ -635,26 +811,12 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                 'update_available': self.plugin_data['update_available'],
                 'latest_version': self.plugin_data['latest_version'],
                 'installation_type': self.plugin_data['installation_type'],
-                'permissions': json.dumps(self.plugin_data['permissions'])
-            })
+                'permissions': _PLUGIN_PERMISSIONS_JSON
+            }
             
-            modules_created = []
-            for module_data in self.module_data:
-                module_id = f"{user_id}_{plugin_slug}_{module_data['name']}"
-                
-                module_stmt = text("""
-                INSERT INTO module
-                (id, plugin_id, name, display_name, description, icon, category,
-                enabled, priority, props, config_fields, messages, required_services,
-                dependencies, layout, tags, created_at, updated_at, user_id)
-                VALUES
-                (:id, :plugin_id, :name, :display_name, :description, :icon, :category,
-                :enabled, :priority, :props, :config_fields, :messages, :required_services,
-                :dependencies, :layout, :tags, :created_at, :updated_at, :user_id)
-                """)
-                
-                await db.execute(module_stmt, {
-                    'id': module_id,
+            module_params = [
+                {
+                    'id': f"{user_id}_{plugin_slug}_{module_data['name']}",
                     'plugin_id': plugin_id,
                     'name': module_data['name'],
                     'display_name': module_data['display_name'],
@@ -663,82 +825,85 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                     'category': module_data['category'],
                     'enabled': True,
                     'priority': module_data['priority'],
-                    'props': json.dumps(module_data['props']),
-                    'config_fields': json.dumps(module_data['config_fields']),
-                    'messages': json.dumps(module_data['messages']),
-                    'required_services': json.dumps(module_data['required_services']),
-                    'dependencies': json.dumps(module_data['dependencies']),
-                    'layout': json.dumps(module_data['layout']),
-                    'tags': json.dumps(module_data['tags']),
+                    'props': module_data['props'],
+                    'config_fields': module_data['config_fields'],
+                    'messages': module_data['messages'],
+                    'required_services': module_data['required_services'],
+                    'dependencies': module_data['dependencies'],
+                    'layout': module_data['layout'],
+                    'tags': module_data['tags'],
                     'created_at': current_time,
                     'updated_at': current_time,
                     'user_id': user_id
-                })
-                
-                modules_created.append(module_id)
-            
-            # Commit the transaction
-            await db.commit()
-            logger.info(f"BrainDriveChat: Database transaction committed successfully")
-            
-            # Verify the plugin was actually created
-            verify_query = text("SELECT id, plugin_slug FROM plugin WHERE id = :plugin_id AND user_id = :user_id")
-            verify_result = await db.execute(verify_query, {'plugin_id': plugin_id, 'user_id': user_id})
-            verify_row = verify_result.fetchone()
-            
-            if verify_row:
-                logger.info(f"BrainDriveChat: Successfully created and verified database records for plugin {plugin_id} with {len(modules_created)} modules")
+                }
+                for module_data in _MODULE_DATA_DB
+            ]
+            
+            # Insert the plugin and all of its modules in one explicit transaction;
+            # the modules go in a single executemany round trip
+            async with _transaction(db):
+                await db.execute(_PLUGIN_INSERT_STMT, plugin_params)
+                if module_params:
+                    await db.execute(_MODULE_INSERT_STMT, module_params)
+            logger.info("BrainDriveChat: Database transaction committed successfully")
+            
+            # Verify the plugin was actually created, reading the module rows back in
+            # the same round trip so modules_created reflects what is in the database
+            verify_result = await db.execute(_VERIFY_INSTALL_QUERY, {'plugin_id': plugin_id, 'user_id': user_id})
+            verify_rows = verify_result.fetchall()
+            
+            if verify_rows:
+                modules_created = [module_id for _plugin_id, module_id in verify_rows if module_id is not None]
+                logger.info("BrainDriveChat: Successfully created and verified database records", plugin_id=plugin_id, modules=len(modules_created))
             else:
-                logger.error(f"BrainDriveChat: Plugin creation appeared to succeed but verification failed for plugin_id: {plugin_id}")
+                logger.error("BrainDriveChat: Plugin creation appeared to succeed but verification failed", plugin_id=plugin_id)
                 return {'success': False, 'error': 'Plugin creation verification failed'}
             
             return {'success': True, 'plugin_id': plugin_id, 'modules_created': modules_created}
             
         except Exception as e:
-            logger.error(f"Error creating database records: {e}")
-            await db.rollback()
+            logger.error("BrainDriveChat: Error creating database records", error=str(e))
             return {'success': False, 'error': str(e)}
     
-    async def _delete_database_records(self, user_id: str, plugin_id: str, db: AsyncSession) -> Dict[str, Any]:
-        """Delete plugin and module records from database"""
+    async def _delete_database_records(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
+        """Delete the user's plugin and module records and report the deleted plugin id"""
+        # Reject malformed values for the columns that scope the DELETEs before issuing them
+        plugin_slug = self.plugin_data['plugin_slug']
+        if not (isinstance(user_id, str) and user_id and isinstance(plugin_slug, str) and plugin_slug):
+            return {'success': False, 'error': 'Invalid user_id or plugin_slug'}
+        
         try:
-            # Delete modules first (foreign key constraint)
-            module_delete_stmt = text("""
-            DELETE FROM module 
-            WHERE plugin_id = :plugin_id AND user_id = :user_id
-            """)
-            
-            module_result = await db.execute(module_delete_stmt, {
-                'plugin_id': plugin_id,
-                'user_id': user_id
-            })
-            
-            deleted_modules = module_result.rowcount
-            
-            # Delete plugin
-            plugin_delete_stmt = text("""
-            DELETE FROM plugin 
-            WHERE id = :plugin_id AND user_id = :user_id
-            """)
-            
-            plugin_result = await db.execute(plugin_delete_stmt, {
-                'plugin_id': plugin_id,
-                'user_id': user_id
-            })
-            
-            if plugin_result.rowcount == 0:
-                await db.rollback()
-                return {'success': False, 'error': 'Plugin not found or not owned by user'}
-            
-            # Commit the transaction
-            await db.commit()
+            params = {'user_id': user_id, 'plugin_slug': plugin_slug}
+            use_returning = _supports_delete_returning(db)
+            
+            # Both deletes share one transaction; a missing plugin row rolls it back
+            async with _transaction(db):
+                # Without RETURNING, read the real id (which may predate the
+                # {user_id}_{slug} format) before the row is gone
+                if not use_returning:
+                    plugin_row = (await db.execute(_PLUGIN_STATUS_QUERY, params)).fetchone()
+                    if not plugin_row:
+                        raise _PluginNotFoundError()
+                
+                # Delete modules first (foreign key constraint)
+                module_result = await db.execute(_MODULE_DELETE_STMT, params)
+                deleted_modules = module_result.rowcount
+                
+                # Delete plugin
+                if use_returning:
+                    plugin_row = (await db.execute(_PLUGIN_DELETE_RETURNING_STMT, params)).fetchone()
+                    if not plugin_row:
+                        raise _PluginNotFoundError()
+                else:
+                    await db.execute(_PLUGIN_DELETE_STMT, params)
             
-            logger.info(f"Deleted database records for plugin {plugin_id} ({deleted_modules} modules)")
-            return {'success': True, 'deleted_modules': deleted_modules}
+            logger.info("BrainDriveChat: Deleted database records", plugin_id=plugin_row.id, deleted_modules=deleted_modules)
+            return {'success': True, 'plugin_id': plugin_row.id, 'deleted_modules': deleted_modules}
             
+        except _PluginNotFoundError:
+            return {'success': False, 'error': 'Plugin not found for user'}
         except Exception as e:
-            logger.error(f"Error deleting database records: {e}")
-            await db.rollback()
+            logger.error("BrainDriveChat: Error deleting database records", user_id=user_id, error=str(e))
             return {'success': False, 'error': str(e)}
     
     async def _export_user_data(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
@@ -773,16 +938,17 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
             })
             
             modules_data = {}
-            for module_row in module_result.fetchall():
+            # Unpack rows positionally (column order matches the SELECT above)
+            for name, raw_config_fields, enabled, priority in module_result.fetchall():
                 try:
-                    config_fields = json.loads(module_row.config_fields) if module_row.config_fields else {}
+                    config_fields = json.loads(raw_config_fields) if raw_config_fields else {}
                 except json.JSONDecodeError:
                     config_fields = {}
                 
-                modules_data[module_row.name] = {
+                modules_data[name] = {
                     'config_fields': config_fields,
-                    'enabled': module_row.enabled,
-                    'priority': module_row.priority
+                    'enabled': enabled,
+                    'priority': priority
                 }
             
             user_data = {
@@ -852,13 +1018,8 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
             raise
     
     def get_plugin_info(self) -> Dict[str, Any]:
-        """Get plugin information (compatibility method)"""
-        return self.plugin_data
-    
-    @property
-    def MODULE_DATA(self):
-        """Compatibility property for accessing module data"""
-        return self.module_data
+        """Get plugin information as a fresh plain copy (compatibility method)"""
+        return _thaw(self.plugin_data)
     
     # Compatibility methods for old interface
     async def install_plugin(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
@@ -876,6 +1037,10 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
                     'plugin_id': existing_check['plugin_id']
                 }
             
+            # Managers are shared across calls, so the database is authoritative;
+            # drop any stale in-memory record left by an uninstall done elsewhere
+            self.active_users.discard(user_id)
+            
             shared_path = self.shared_path
             shared_path.mkdir(parents=True, exist_ok=True)
             logger.info(f"BrainDriveChat: Created shared directory: {shared_path}")
@@ -925,27 +1090,71 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
     async def delete_plugin(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
         """Delete BrainDriveChat plugin for user (compatibility method)"""
         try:
-            logger.info(f"BrainDriveChat: Starting deletion for user {user_id}")
+            logger.info("BrainDriveChat: Starting deletion", user_id=user_id)
             
             # Let the base class handle the deletion - it will call _perform_user_uninstallation
             # which includes the database check
             result = await self.uninstall_for_user(user_id, db)
             
             if result.get('success'):
-                logger.info(f"BrainDriveChat: Successfully deleted plugin for user {user_id}")
+                logger.info("BrainDriveChat: Successfully deleted plugin", user_id=user_id)
             else:
-                logger.error(f"BrainDriveChat: Deletion failed: {result.get('error')}")
+                logger.error("BrainDriveChat: Deletion failed", user_id=user_id, error=result.get('error'))
             
             return result
         except Exception as e:
-            logger.error(f"BrainDriveChat: Delete plugin failed: {e}")
+            logger.error("BrainDriveChat: Delete plugin failed", user_id=user_id, error=str(e))
+            return {'success': False, 'error': str(e)}
+    
+    async def delete_plugin_bulk(self, user_ids: List[str], db: AsyncSession) -> Dict[str, Any]:
+        """Delete BrainDriveChat plugin for several users in one transaction (admin sweeps)"""
+        # Reject malformed input before issuing any DELETE; only real collections are
+        # accepted, since a bare string would be iterated character by character
+        if not isinstance(user_ids, (list, tuple, set, frozenset)) or not all(
+            isinstance(user_id, str) and user_id for user_id in user_ids
+        ):
+            return {'success': False, 'error': 'Invalid user_ids'}
+        
+        try:
+            # Drop duplicate ids while keeping the caller's order
+            user_ids = list(dict.fromkeys(user_ids))
+            if not user_ids:
+                return {'success': True, 'deleted_user_ids': []}
+            
+            params = {
+                'plugin_slug': self.plugin_data['plugin_slug'],
+                'user_ids': user_ids
+            }
+            
+            # A fixed number of statements regardless of how many users are affected
+            async with _transaction(db):
+                owners_result = await db.execute(_BULK_PLUGIN_OWNERS_QUERY, params)
+                deleted_user_ids = [user_id for (user_id,) in owners_result.fetchall()]
+                if deleted_user_ids:
+                    # Delete modules first (foreign key constraint)
+                    await db.execute(_BULK_MODULE_DELETE_STMT, params)
+                    await db.execute(_BULK_PLUGIN_DELETE_STMT, params)
+            
+            for user_id in deleted_user_ids:
+                self.active_users.discard(user_id)
+            
+            logger.info("BrainDriveChat: Bulk deletion completed", requested=len(user_ids), deleted=len(deleted_user_ids))
+            return {'success': True, 'deleted_user_ids': deleted_user_ids}
+            
+        except Exception as e:
+            logger.error("BrainDriveChat: Bulk deletion failed", error=str(e))
             return {'success': False, 'error': str(e)}
     
     async def get_plugin_status(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
         """Get current status of BrainDriveChat plugin installation (compatibility method)"""
         try:
-            existing_check = await self._check_existing_plugin(user_id, db)
-            if not existing_check['exists']:
+            # Single lookup on (user_id, plugin_slug), the same key install uses
+            result = await db.execute(_PLUGIN_STATUS_QUERY, {
+                'user_id': user_id,
+                'plugin_slug': self.plugin_data['plugin_slug']
+            })
+            plugin_row = result.fetchone()
+            if not plugin_row:
                 return {'exists': False, 'status': 'not_installed'}
             
             # Check if shared plugin files exist
@@ -954,8 +1163,15 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
             return {
                 'exists': True,
                 'status': 'healthy' if plugin_health['healthy'] else 'unhealthy',
-                'plugin_id': existing_check['plugin_id'],
-                'plugin_info': existing_check['plugin_info'],
+                'plugin_id': plugin_row.id,
+                'plugin_info': {
+                    'id': plugin_row.id,
+                    'name': plugin_row.name,
+                    'version': plugin_row.version,
+                    'enabled': plugin_row.enabled,
+                    'created_at': plugin_row.created_at,
+                    'updated_at': plugin_row.updated_at
+                },
                 'health_details': plugin_health['details']
             }
             
@@ -998,16 +1214,25 @@ class BrainDriveChatLifecycleManager(BaseLifecycleManager):
 
 
 # Standalone functions for compatibility with remote installer
+@lru_cache(maxsize=8)
+def _get_manager(plugins_base_dir: Optional[str]) -> BrainDriveChatLifecycleManager:
+    """Return the shared lifecycle manager for a plugins directory, creating it on first use"""
+    return BrainDriveChatLifecycleManager(plugins_base_dir)
+
 async def install_plugin(user_id: str, db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
-    manager = BrainDriveChatLifecycleManager(plugins_base_dir)
+    manager = _get_manager(plugins_base_dir)
     return await manager.install_plugin(user_id, db)
 
 async def delete_plugin(user_id: str, db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
-    manager = BrainDriveChatLifecycleManager(plugins_base_dir)
+    manager = _get_manager(plugins_base_dir)
     return await manager.delete_plugin(user_id, db)
 
+async def delete_plugin_bulk(user_ids: List[str], db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
+    manager = _get_manager(plugins_base_dir)
+    return await manager.delete_plugin_bulk(user_ids, db)
+
 async def get_plugin_status(user_id: str, db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
-    manager = BrainDriveChatLifecycleManager(plugins_base_dir)
+    manager = _get_manager(plugins_base_dir)
     return await manager.get_plugin_status(user_id, db)
 
 async def update_plugin(user_id: str, db: AsyncSession, new_version_manager: 'BrainDriveChatLifecycleManager', plugins_base_dir: str = None) -> Dict[str, Any]:
@@ -1015,23 +1240,24 @@ async def update_plugin(user_id: str, db: AsyncSession, new_version_manager: 'Br
     return await old_manager.update_plugin(user_id, db, new_version_manager)
 
 
-# Test script for development
-if __name__ == "__main__":
-    import sys
-    import asyncio
-    
+# Test script for development: python lifecycle_manager.py test
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == "test":
     async def main():
         print("BrainDriveChat Plugin Lifecycle Manager - Test Mode")
         print("=" * 50)
         
         # Test manager initialization
         manager = BrainDriveChatLifecycleManager()
-        print(f"Plugin: {manager.plugin_data['name']}")
-        print(f"Version: {manager.plugin_data['version']}")
-        print(f"Slug: {manager.plugin_data['plugin_slug']}")
-        print(f"Modules: {len(manager.module_data)}")
+        plugin_data = manager.plugin_data
+        module_data = manager.module_data
         
-        for module in manager.module_data:
-            print(f"  - {module['display_name']} ({module['name']})")
+        # Build the summary once and print it in a single call
+        print("\n".join([
+            f"Plugin: {plugin_data['name']}",
+            f"Version: {plugin_data['version']}",
+            f"Slug: {plugin_data['plugin_slug']}",
+            f"Modules: {len(module_data)}",
+            *(f"  - {module['display_name']} ({module['name']})" for module in module_data)
+        ]))
     
     asyncio.run(main())